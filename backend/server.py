@@ -1,8 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends, status, File, UploadFile, Form
+from fastapi import FastAPI, APIRouter, HTTPException, Request, Depends, status, File, UploadFile, Form, Query
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import StreamingResponse
+from fastapi.responses import StreamingResponse, ORJSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.middleware.gzip import GZipMiddleware
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 import logging
@@ -51,6 +52,20 @@ ALLOWED_IMAGE_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp"}
 ALLOWED_VIDEO_TYPES = {"video/mp4", "video/avi", "video/mov", "video/webm"}
 ALLOWED_MEDIA_TYPES = ALLOWED_IMAGE_TYPES | ALLOWED_VIDEO_TYPES
 
+# Leaderboard configuration
+LEADERBOARD_MAX_LIMIT = 100
+
+# Claims feed configuration
+CLAIMS_MAX_LIMIT = 100
+# Oldest verifications counted towards a claim's verdict
+VERDICT_MAX_VERIFICATIONS = 1000
+VERIFY_BATCH_MAX = 50
+
+# Response compression: JSON bodies below this size aren't worth the CPU
+GZIP_MIN_SIZE = 1000
+GZIP_LEVEL = 5
+MEDIA_ROUTE_PREFIX = "/api/media/"
+
 # Authentication setup
 SECRET_KEY = os.environ.get("SECRET_KEY", "peerfact-secret-key-change-in-production")
 ALGORITHM = "HS256"
@@ -176,6 +191,7 @@ class VerificationModel(BaseModel):
     source_url: Optional[str] = None
     explanation: Optional[str] = None
     created_at: datetime
+    verdict: Optional[Dict[str, Any]] = None  # claim verdict after this verification
 
 
 # Payments models
@@ -266,21 +282,26 @@ async def get_current_active_user(current_user: Optional[Dict[str, Any]] = Depen
 # --------------------------------------
 # Utilities
 # --------------------------------------
+# verdict label -> stance that agrees with it
+_ALIGN_MAP = {"Mostly True": "support", "Mostly False": "refute", "Unclear": "unclear"}
+
+
 async def get_user(user_id: str) -> Optional[Dict[str, Any]]:
     user = await db.users.find_one({"id": user_id}, {"_id": 0})
     return user
 
 
-async def get_user_rep(user_id: str) -> float:
-    user = await get_user(user_id)
-    if not user:
-        return 1.0
-    return float(user.get("reputation", 1.0))
+async def get_user_reps(user_ids) -> Dict[str, float]:
+    """Reputation of each known user, fetched in one query."""
+    ids = list(set(user_ids))
+    if not ids:
+        return {}
+    users = await db.users.find({"id": {"$in": ids}}, {"_id": 0, "id": 1, "reputation": 1}).to_list(len(ids))
+    return {u["id"]: float(u.get("reputation", 1.0)) for u in users}
 
 
-async def compute_verdict(claim_id: str) -> Dict[str, Any]:
-    """Compute weighted stance and confidence from verifications."""
-    verifs = await db.verifications.find({"claim_id": claim_id}, {"_id": 0}).to_list(1000)
+def tally_verdict(verifs: List[Dict[str, Any]], reps: Dict[str, float]) -> Dict[str, Any]:
+    """Weighted stance and confidence from verifications; unknown authors weigh 1.0."""
     if not verifs:
         return {"label": "Unverified", "confidence": 0.0, "support": 0, "refute": 0, "unclear": 0}
 
@@ -288,8 +309,7 @@ async def compute_verdict(claim_id: str) -> Dict[str, Any]:
     counts = {"support": 0, "refute": 0, "unclear": 0}
 
     for v in verifs:
-        rep = await get_user_rep(v["author_id"])  # weight by reputation
-        weights[v["stance"]] += rep
+        weights[v["stance"]] += reps.get(v["author_id"], 1.0)  # weight by reputation
         counts[v["stance"]] += 1
 
     label_key = max(weights, key=weights.get)
@@ -308,6 +328,27 @@ async def compute_verdict(claim_id: str) -> Dict[str, Any]:
     }
 
 
+async def compute_verdict(claim_id: str) -> Dict[str, Any]:
+    """Compute weighted stance and confidence from verifications."""
+    return (await compute_verdicts([claim_id]))[claim_id]
+
+
+async def compute_verdicts(claim_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """Verdicts for many claims: one aggregation groups each claim's oldest
+    VERDICT_MAX_VERIFICATIONS verifications, and reputations are fetched in
+    one query. compute_verdict goes through here too, so the feed, detail
+    and verdict routes always agree."""
+    groups = await db.verifications.aggregate([
+        {"$match": {"claim_id": {"$in": claim_ids}}},
+        {"$sort": {"created_at": 1}},
+        {"$group": {"_id": "$claim_id", "verifs": {"$push": {"author_id": "$author_id", "stance": "$stance"}}}},
+        {"$project": {"verifs": {"$slice": ["$verifs", VERDICT_MAX_VERIFICATIONS]}}},
+    ]).to_list(None)
+    by_claim = {g["_id"]: g["verifs"] for g in groups}
+    reps = await get_user_reps(v["author_id"] for verifs in by_claim.values() for v in verifs)
+    return {cid: tally_verdict(by_claim.get(cid, []), reps) for cid in claim_ids}
+
+
 async def try_ai_analyze(text: str, link: Optional[str] = None) -> Dict[str, Any]:
     """Enhanced AI analysis using the advanced AI engine"""
     try:
@@ -885,12 +926,20 @@ async def create_claim(body: ClaimCreate, current_user: Optional[dict] = Depends
 
 
 @api_router.get("/claims", response_model=List[ClaimModel])
-async def list_claims():
-    claims = await db.claims.find({}, {"_id": 0}).sort("created_at", -1).to_list(100)
+async def list_claims(
+    has_media: Optional[bool] = None,
+    limit: int = Query(CLAIMS_MAX_LIMIT, ge=1, le=CLAIMS_MAX_LIMIT),
+):
+    query: Dict[str, Any] = {}
+    if has_media is not None:
+        media_cond = [{"media_urls.0": {"$exists": True}}, {"media_base64": {"$nin": [None, ""]}}]
+        query = {"$or": media_cond} if has_media else {"$nor": media_cond}
+    claims = await db.claims.find(query, {"_id": 0}).sort("created_at", -1).to_list(limit)
 
+    verdicts = await compute_verdicts([c["id"] for c in claims])
     enriched: List[ClaimModel] = []
     for c in claims:
-        verdict = await compute_verdict(c["id"])
+        verdict = verdicts[c["id"]]
         c = dict(c)
         c["support_count"] = verdict.get("support", 0)
         c["refute_count"] = verdict.get("refute", 0)
@@ -940,14 +989,14 @@ async def add_verification(claim_id: str, body: VerificationCreate, current_user
 
     # reputation tweak
     current = await compute_verdict(claim_id)
-    align_map = {"Mostly True": "support", "Mostly False": "refute", "Unclear": "unclear"}
-    align_key = align_map.get(current.get("label", "Unclear"), "unclear")
+    align_key = _ALIGN_MAP.get(current.get("label", "Unclear"), "unclear")
     if body.stance == align_key:
         await db.users.update_one({"id": author_id}, {"$inc": {"reputation": 0.1}})
     else:
         await db.users.update_one({"id": author_id}, {"$inc": {"reputation": -0.05}})
 
     # Record updated reputation and claim verification on blockchain
+    final_verdict = None
     try:
         # Get updated user reputation
         updated_user = await get_user(author_id)
@@ -974,7 +1023,26 @@ async def add_verification(claim_id: str, body: VerificationCreate, current_user
     except Exception as e:
         logging.warning(f"Blockchain recording failed for verification: {e}")
 
-    return VerificationModel(**clean_doc(doc))
+    if final_verdict is None:
+        final_verdict = await compute_verdict(claim_id)
+    return VerificationModel(**clean_doc(doc), verdict=final_verdict)
+
+
+@api_router.post("/claims/{claim_id}/verify/batch", response_model=List[VerificationModel])
+async def add_verifications(claim_id: str, body: List[VerificationCreate], current_user: Optional[dict] = Depends(get_current_user)):
+    if not body or len(body) > VERIFY_BATCH_MAX:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{VERIFY_BATCH_MAX} verifications")
+    if not await db.claims.find_one({"id": claim_id}):
+        raise HTTPException(status_code=404, detail="Claim not found")
+    # Reject the whole batch up front rather than stopping half way through
+    if not current_user:
+        author_ids = {v.author_id for v in body}
+        known = await db.users.count_documents({"id": {"$in": list(author_ids)}})
+        if known != len(author_ids):
+            raise HTTPException(status_code=400, detail="Invalid author_id")
+
+    # Applied in order, so each reputation tweak sees the verdict left by the previous one
+    return [await add_verification(claim_id, v, current_user) for v in body]
 
 
 @api_router.get("/claims/{claim_id}/verdict")
@@ -1112,26 +1180,26 @@ async def get_detailed_claim(claim_id: str):
 # --------------------------------------
 # Routes: Leaderboard & Source Reliability (Phase 2)
 # --------------------------------------
-@api_router.get("/leaderboard/users")
-async def leaderboard_users(limit: int = 20):
+@api_router.get("/leaderboard/users", response_class=ORJSONResponse)
+async def leaderboard_users(limit: int = Query(20, ge=1, le=LEADERBOARD_MAX_LIMIT)):
     users = await db.users.find({}, {"_id": 0}).to_list(1000)
     # compute verifications count and alignment rate
     verifs = await db.verifications.find({}, {"_id": 0}).to_list(5000)
 
     # group by user
-    stats: Dict[str, Dict[str, Any]] = {}
-    for u in users:
-        stats[u["id"]] = {"user": u, "verif_count": 0, "aligned": 0}
+    stats: Dict[str, Dict[str, Any]] = {u["id"]: {"user": u, "verif_count": 0, "aligned": 0} for u in users}
 
     # alignment vs current majority
     for v in verifs:
-        stats.setdefault(v["author_id"], {"user": {"id": v["author_id"], "username": "unknown", "reputation": 1.0}, "verif_count": 0, "aligned": 0})
-        stats[v["author_id"]]["verif_count"] += 1
+        aid = v["author_id"]
+        s = stats.get(aid)
+        if s is None:
+            s = stats[aid] = {"user": {"id": aid, "username": "unknown", "reputation": 1.0}, "verif_count": 0, "aligned": 0}
+        s["verif_count"] += 1
         try:
             verdict = await compute_verdict(v["claim_id"])  # can be cached later
-            align_map = {"Mostly True": "support", "Mostly False": "refute", "Unclear": "unclear"}
-            if v["stance"] == align_map.get(verdict.get("label", "Unclear"), "unclear"):
-                stats[v["author_id"]]["aligned"] += 1
+            if v["stance"] == _ALIGN_MAP.get(verdict.get("label", "Unclear"), "unclear"):
+                s["aligned"] += 1
         except Exception:
             pass
 
@@ -1144,6 +1212,7 @@ async def leaderboard_users(limit: int = 20):
         rows.append({
             "id": user_id,
             "username": d["user"].get("username", "unknown"),
+            # rounded before sorting, so $inc float noise can't split ties
             "reputation": round(float(d["user"].get("reputation", 1.0)), 3),
             "verifications": verif_count,
             "accuracy": round(acc, 3),
@@ -1153,8 +1222,8 @@ async def leaderboard_users(limit: int = 20):
     return rows[:limit]
 
 
-@api_router.get("/leaderboard/sources")
-async def leaderboard_sources(limit: int = 20):
+@api_router.get("/leaderboard/sources", response_class=ORJSONResponse)
+async def leaderboard_sources(limit: int = Query(20, ge=1, le=LEADERBOARD_MAX_LIMIT)):
     verifs = await db.verifications.find({}, {"_id": 0}).to_list(5000)
     by_domain: Dict[str, Dict[str, Any]] = {}
 
@@ -1176,8 +1245,7 @@ async def leaderboard_sources(limit: int = 20):
         by_domain[domain]["total"] += 1
         try:
             verdict = await compute_verdict(v["claim_id"])  # uses current majority
-            align_map = {"Mostly True": "support", "Mostly False": "refute", "Unclear": "unclear"}
-            if v["stance"] == align_map.get(verdict.get("label", "Unclear"), "unclear"):
+            if v["stance"] == _ALIGN_MAP.get(verdict.get("label", "Unclear"), "unclear"):
                 by_domain[domain]["aligned"] += 1
         except Exception:
             pass
@@ -1199,6 +1267,8 @@ PACKAGES = {  # server-side only pricing, amounts are floats in USD
     "pro": 15.00,
     "donation": 3.00,
 }
+PACKAGE_META = {pid: {"amount": float(v), "currency": "usd"} for pid, v in PACKAGES.items()}
+_SUCCESS_TMPL = "{origin}?session_id={{CHECKOUT_SESSION_ID}}"
 
 
 @api_router.post("/payments/v1/checkout/session")
@@ -1213,11 +1283,12 @@ async def create_checkout_session(req: CreateCheckoutRequest, http_request: Requ
         raise HTTPException(status_code=500, detail=f"Stripe library missing: {e}")
 
     package_id = req.package_id
-    if package_id not in PACKAGES:
+    meta = PACKAGE_META.get(package_id)
+    if meta is None:
         raise HTTPException(status_code=400, detail="Invalid package")
 
-    amount = float(PACKAGES[package_id])
-    currency = "usd"
+    amount = meta["amount"]
+    currency = meta["currency"]
 
     # Build success/cancel URLs from origin
     origin = req.origin_url or http_request.headers.get("origin")
@@ -1225,7 +1296,7 @@ async def create_checkout_session(req: CreateCheckoutRequest, http_request: Requ
         # Try reconstruct from request
         base = str(http_request.base_url).rstrip('/')
         origin = base
-    success_url = f"{origin}?session_id={{CHECKOUT_SESSION_ID}}"
+    success_url = _SUCCESS_TMPL.format(origin=origin)
     cancel_url = origin
 
     # Initialize stripe checkout
@@ -1254,8 +1325,14 @@ async def create_checkout_session(req: CreateCheckoutRequest, http_request: Requ
     return {"url": session.url, "session_id": session.session_id}
 
 
-@api_router.get("/payments/v1/checkout/status/{session_id}")
+@api_router.get("/payments/v1/checkout/status/{session_id}", response_class=ORJSONResponse)
 async def checkout_status(session_id: str):
+    # Only sessions created through create_checkout_session have a row to
+    # update; don't query Stripe (or insert a partial row) for anything else
+    if not await db.payment_transactions.count_documents({"session_id": session_id}, limit=1):
+        logging.warning("Checkout status requested for unknown session_id %s", session_id)
+        raise HTTPException(status_code=404, detail="Unknown checkout session")
+
     api_key = os.environ.get("STRIPE_API_KEY")
     if not api_key:
         raise HTTPException(status_code=500, detail="Stripe not configured")
@@ -1269,8 +1346,8 @@ async def checkout_status(session_id: str):
     stripe_checkout = StripeCheckout(api_key=api_key, webhook_url="")
     status = await stripe_checkout.get_checkout_status(session_id)
 
-    # Update once
-    await db.payment_transactions.update_one(
+    # Update once; the canonical row is inserted by create_checkout_session
+    res = await db.payment_transactions.update_one(
         {"session_id": session_id},
         {"$set": {
             "status": status.status,
@@ -1280,8 +1357,9 @@ async def checkout_status(session_id: str):
             "metadata": status.metadata,
             "updated_at": datetime.utcnow(),
         }},
-        upsert=True,
     )
+    if res.matched_count == 0:
+        logging.warning("Checkout transaction %s vanished before its status update", session_id)
 
     return {
         "status": status.status,
@@ -1339,6 +1417,20 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+class JSONGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that leaves /api/media/ alone: those routes stream
+    image and video bytes that are already compressed."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(MEDIA_ROUTE_PREFIX):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+
+app.add_middleware(JSONGZipMiddleware, minimum_size=GZIP_MIN_SIZE, compresslevel=GZIP_LEVEL)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,